@@ -2,6 +2,7 @@ import argparse
 import logging
 import os
 
+from src.consts import MAX_DOWNLOAD_WORKERS
 from src.core import download_memories
 
 # Configure logging to display messages to the console
@@ -32,6 +33,14 @@ def main():
         help="The path to the directory where media files will be downloaded and processed."
     )
 
+    # Argument 3: Number of concurrent downloads (optional)
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=MAX_DOWNLOAD_WORKERS,
+        help=f"The number of memories downloaded concurrently (default: {MAX_DOWNLOAD_WORKERS})."
+    )
+
     args = parser.parse_args()
 
     # Validate the input HTML file path
@@ -39,14 +48,20 @@ def main():
         logger.error(f"Error: Input file not found at {args.memories_path}")
         return
 
+    # Validate the number of concurrent downloads
+    if args.workers < 1:
+        logger.error(f"Error: Number of workers must be at least 1, got {args.workers}")
+        return
+
     # Ensure the download directory exists (or create it)
     os.makedirs(args.download_dir, exist_ok=True)
 
     logger.info(f"Using memories file: '{args.memories_path}'")
     logger.info(f"Saving media to directory: '{args.download_dir}'")
+    logger.info(f"Concurrent downloads: {args.workers}")
 
     # Downloading memories
-    download_memories(args.memories_path, args.download_dir)
+    download_memories(args.memories_path, args.download_dir, args.workers)
 
 
 if __name__ == "__main__":
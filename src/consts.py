@@ -1,2 +1,12 @@
+import os
+
 MAX_RETRIES = 3
-DOWNLOAD_DELAYS_SEC = 2  # Delay between downloads (2000ms in JS)
+DOWNLOAD_DELAYS_SEC = 2  # Delay between download retries (2000ms in JS)
+MAX_DOWNLOAD_WORKERS = 8  # Number of memories downloaded concurrently
+MAX_REQUESTS_PER_SEC = 4  # Cap on download requests started per second across all workers
+RANGE_DOWNLOAD_MIN_BYTES = 16 * 1024 * 1024  # Memories at least this large are downloaded over multiple connections
+RANGE_DOWNLOAD_PARTS = 4  # Number of byte ranges (connections) used for a single large memory
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # Bytes read from the network and written to disk at once
+MAX_METADATA_WORKERS = os.cpu_count() or 1  # Number of ExifTool processes updating metadata in parallel
+MAX_EXTRACT_WORKERS = os.cpu_count() or 1  # Number of zip files extracted in parallel
+EXTRACT_CHUNK_SIZE = 1024 * 1024  # Bytes copied at once from a zip entry to its extracted file
@@ -1,22 +1,42 @@
 import logging
 import os
 import re
+import queue
 import shutil
-import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from io import StringIO
+from typing import List, Optional
 
+import lxml.html
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
 from exiftool import ExifToolHelper
+from requests.adapters import HTTPAdapter
 
-from src.consts import MAX_RETRIES, DOWNLOAD_DELAYS_SEC
-from src.utils import retry, is_system_file, get_already_downloaded_files, extract_latitude_longitude, get_extension
+from src.consts import (
+    MAX_RETRIES, DOWNLOAD_DELAYS_SEC, MAX_DOWNLOAD_WORKERS, MAX_REQUESTS_PER_SEC, RANGE_DOWNLOAD_MIN_BYTES,
+    RANGE_DOWNLOAD_PARTS, DOWNLOAD_CHUNK_SIZE, MAX_METADATA_WORKERS, MAX_EXTRACT_WORKERS, EXTRACT_CHUNK_SIZE
+)
+from src.utils import (
+    retry, rate_limit, is_system_file, get_already_downloaded_files, preallocate_file,
+    get_extension
+)
 
 logger = logging.getLogger(__file__)
 
+# Regex pattern to capture the URL and the boolean value from the onclick attribute of download links
+_ONCLICK_RE = re.compile(r"downloadMemories\('(.*?)', this, (true|false)\);")
+
+# Coordinates of a memory, following pattern 'Latitude, Longitude: number, number'
+_COORD_RE = re.compile(r"Latitude, Longitude: (-?\d+\.?\d*), (-?\d+\.?\d*)")
+
+# Shared session so that download workers reuse pooled keep-alive connections, pool is sized for the workers
+_SESSION = requests.Session()
+
+# Single limiter shared by all fetch functions so that every download request counts towards the same cap
+_request_rate_limit = rate_limit(calls_per_sec=MAX_REQUESTS_PER_SEC)
+
 
 def _construct_dataframe(memories_html_path: str) -> pd.DataFrame:
     """
@@ -24,27 +44,46 @@ def _construct_dataframe(memories_html_path: str) -> pd.DataFrame:
     """
     logger.info(f"Constructing dataframe from: '{memories_html_path}'")
 
-    # Use pandas.read_html to quickly extract the table content
+    # Parse the HTML once with lxml, the cell texts and the download button of each row are read in the same pass
     with open(memories_html_path, "r") as file:
-        html_content = file.read()
-        df = pd.read_html(StringIO(html_content))[0]  # First table in HTML
-
-    # Renaming columns
-    df = df.rename(columns={
-        df.columns[0]: "timestamp_str",  # UTC-based time when media was captured
-        df.columns[1]: "media_type",  # Image or Video
-        df.columns[2]: "coordinates",  # Latitude, Longitude -40.0, 70.0
-        df.columns[3]: "download_link",  # A button containing <a> with download link
+        tree = lxml.html.fromstring(file.read())
+
+    # Lists to store the extracted data
+    timestamp_strs, media_types, coordinates, onclick_contents = [], [], [], []
+
+    # Iterate through data rows of the first table, the header row only contains <th> cells and is skipped
+    for row in tree.xpath("(//table)[1]//tr[td]"):
+        cells = row.xpath("td")
+        timestamp_strs.append(cells[0].text_content().strip())
+        media_types.append(cells[1].text_content().strip())
+        coordinates.append(cells[2].text_content().strip())
+
+        # Find the onclick attribute of the <a> tag in the download link cell
+        onclick_content = row.xpath("td//a/@onclick")
+        onclick_contents.append(onclick_content[0] if onclick_content else None)
+
+    # Extracting the URL and the boolean value from all onclick attributes at once, NaN where there is no match
+    extracted = pd.Series(onclick_contents, dtype=object).str.extract(_ONCLICK_RE)
+
+    # Constructing dataframe from the extracted columns
+    df = pd.DataFrame({
+        "timestamp_str": timestamp_strs,  # UTC-based time when media was captured
+        "media_type": media_types,  # Image or Video
+        "coordinates": coordinates,  # Latitude, Longitude -40.0, 70.0
+        "download_link": extracted[0],  # URL from the onclick attribute of the download button
+        # Whether the URL should be fetched with GET or POST, converting "true" or "false" to a Python boolean
+        "is_get_request": extracted[1].map({"true": True, "false": False}),
     })
 
-    # Converting timestamp string to long
-    df["timestamp"] = df["timestamp_str"].apply(lambda ts_str: int(pd.to_datetime(ts_str, utc=True).timestamp() * 1000))
+    # Converting timestamp string to long (milliseconds since epoch)
+    timestamps = pd.to_datetime(df["timestamp_str"], format="%Y-%m-%d %H:%M:%S UTC", utc=True)
+    df["timestamp"] = timestamps.dt.as_unit("ms").astype("int64")
 
     # Updating media type
-    df["media_type"] = df["media_type"].apply(lambda media_type: media_type.replace(' ', '_').lower())
+    df["media_type"] = df["media_type"].str.replace(" ", "_", regex=False).str.lower()
 
     # Adding a new column for filename (without extension)
-    df["file_name"] = df.apply(lambda r: f"{r["timestamp"]}_{r["media_type"]}", axis=1)
+    df["file_name"] = df["timestamp"].astype(str) + "_" + df["media_type"]
 
     # Adding file path column
     df["file_path"] = None
@@ -55,64 +94,27 @@ def _construct_dataframe(memories_html_path: str) -> pd.DataFrame:
     # Adding a new column indicating whether file was extracted
     df["is_extracted"] = False
 
-    # Extracting latitude and longitude
-    def _apply(r):
-        lat, lon = extract_latitude_longitude(r["coordinates"])
-        r["lat"] = lat
-        r["lon"] = lon
-        return r
-
-    df = df.apply(_apply, axis=1)
-
-    # Prepare for extraction of URL and boolean indicator
-    soup = BeautifulSoup(html_content, "html.parser")
-
-    # Find all table data rows (tr)
-    rows = soup.find("table").find("tbody").find_all("tr")
-
-    # The first row is the header, so we skip it (index 0)
-    data_rows = rows[1:]
-
-    # Regex pattern to capture the URL and the boolean value from the onclick attribute:
-    pattern = r"downloadMemories\('(.*?)', this, (true|false)\);"
-
-    # Lists to store the extracted data
-    extracted_links, extracted_booleans = [], []
-
-    # Iterate through rows and extract data
-    for row in data_rows:
-        # Find the <a> tag which contains the onclick attribute
-        a_tag = row.find("a", onclick=True)
-        if a_tag and "onclick" in a_tag.attrs:
-            onclick_content = a_tag["onclick"]
-            match = re.search(pattern, onclick_content)
-            if match:
-                extracted_links.append(match.group(1))
-                # Convert the extracted string boolean ("true" or "false") to a Python boolean
-                extracted_booleans.append(match.group(2) == "true")
-            else:
-                extracted_links.append(None)
-                extracted_booleans.append(None)
-        else:
-            extracted_links.append(None)
-            extracted_booleans.append(None)
-
-    # Add the new columns to the DataFrame
-    df["download_link"] = extracted_links
-    df["is_get_request"] = extracted_booleans
+    # Extracting latitude and longitude from all coordinate strings at once, falling back to 0.0 for invalid ones
+    coords = df["coordinates"].str.extract(_COORD_RE)
+    invalid_coords = coords[0].isna() | coords[1].isna()
+    if invalid_coords.any():
+        logger.warning(f"Invalid coordinate format for {invalid_coords.sum()} memories, using 0.0, 0.0")
+    df["lat"] = pd.to_numeric(coords[0], errors="coerce").fillna(0.0)
+    df["lon"] = pd.to_numeric(coords[1], errors="coerce").fillna(0.0)
 
     # Returning constructed dataframe
     return df
 
 
 @retry(max_retries=MAX_RETRIES, delay=DOWNLOAD_DELAYS_SEC)
+@_request_rate_limit
 def _fetch_response(download_link: str, is_get_request: bool) -> requests.Response:
     """Fetches response from the URL"""
     # Determine Request Method
     if is_get_request:
         # Corresponds to JS GET request with custom headers
         headers = {"X-Snap-Route-Tag": "mem-dmd", "User-Agent": "Mozilla/5.0"}
-        response = requests.get(download_link, headers=headers, stream=True)
+        response = _SESSION.get(download_link, headers=headers, stream=True)
     else:
         # Corresponds to JS POST request
         # Split URL into base and parameters
@@ -122,16 +124,136 @@ def _fetch_response(download_link: str, is_get_request: bool) -> requests.Respon
 
         # The JS code uses application/x-www-form-urlencoded and sends parameters as body
         headers = {"Content-type": "application/x-www-form-urlencoded", "User-Agent": "Mozilla/5.0"}
-        response = requests.post(base_url, data=payload, headers=headers, stream=True)
+        response = _SESSION.post(base_url, data=payload, headers=headers, stream=True)
 
     # Handle response
-    response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
+    try:
+        response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
+    except requests.HTTPError:
+        response.close()  # Releasing the streamed connection before the request is retried
+        raise
     return response
 
 
-def _download_memories(df: pd.DataFrame, download_dir: str):
+@retry(max_retries=MAX_RETRIES, delay=DOWNLOAD_DELAYS_SEC)
+@_request_rate_limit
+def _fetch_range_response(download_link: str, start: int, end: int) -> requests.Response:
+    """Fetches response for the inclusive byte range of the URL"""
+    headers = {
+        "X-Snap-Route-Tag": "mem-dmd",
+        "User-Agent": "Mozilla/5.0",
+        "Range": f"bytes={start}-{end}",
+        "Accept-Encoding": "identity",  # Offsets must be of the decoded file, not of a compressed representation
+    }
+    response = _SESSION.get(download_link, headers=headers, stream=True)
+
+    # Handle response
+    try:
+        response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
+    except requests.HTTPError:
+        response.close()  # Releasing the streamed connection before the request is retried
+        raise
+    return response
+
+
+def _download_range(fd: int, download_link: str, start: int, end: int) -> bool:
+    """Writes the byte range of the URL at its offset in the file, indicates whether server honoured the range"""
+
+    with _fetch_range_response(download_link, start, end) as response:
+        # Server ignored the Range header and is sending the whole file
+        if response.status_code != 206:
+            return False
+
+        offset = start
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            os.pwrite(fd, chunk, offset)
+            offset += len(chunk)
+
+    return True
+
+
+def _download_ranges(download_link: str, file_path: str, content_length: int) -> bool:
+    """
+    Downloads the URL to the file over multiple connections, one byte range per connection.
+    Indicates whether the server honoured the ranges, the file must be downloaded in a single stream otherwise.
+    """
+
+    part_size = -(-content_length // RANGE_DOWNLOAD_PARTS)  # Ceil division
+    ranges = [(start, min(start + part_size, content_length) - 1) for start in range(0, content_length, part_size)]
+
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        # Reserving the whole file upfront, each range is written at its own offset
+        preallocate_file(fd, content_length)
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [executor.submit(_download_range, fd, download_link, start, end) for start, end in ranges]
+            is_ranged = all(future.result() for future in futures)
+    except Exception:
+        # Removing the partially written file so that it isn't treated as downloaded on the next run
+        os.close(fd)
+        os.remove(file_path)
+        raise
+
+    os.close(fd)
+    if not is_ranged:
+        # Removing the preallocated file so that it isn't left behind if the single stream download fails
+        os.remove(file_path)
+    return is_ranged
+
+
+def _download_memory(download_link: str, is_get_request: bool, file_name: str, download_dir: str) -> str:
+    """Downloads a single memory and returns the path where it was saved"""
+
+    # Fetching response
+    response = _fetch_response(download_link, is_get_request)
+
+    # Determining extension from response
+    extension = get_extension(response)
+
+    # Constructing file path
+    file_path = os.path.join(download_dir, f"{file_name}{extension}")
+
+    # Large memories are split into byte ranges downloaded in parallel, when the server supports it
+    content_length = int(response.headers.get("Content-Length", 0))
+    if (
+            is_get_request
+            and hasattr(os, "pwrite")  # Not available on Windows
+            and content_length >= RANGE_DOWNLOAD_MIN_BYTES
+            and response.headers.get("Accept-Ranges") == "bytes"
+            and not response.headers.get("Content-Encoding")  # Ranges would be of the encoded content
+    ):
+        response.close()
+        if _download_ranges(download_link, file_path, content_length):
+            return file_path
+
+        # Falling back to a single stream
+        response = _fetch_response(download_link, is_get_request)
+
+    # Save the file content, copying the raw stream avoids a Python-level loop over chunks
+    # Closing the response once done hands its connection back to the session's pool
+    with response:
+        try:
+            with open(file_path, "wb", buffering=DOWNLOAD_CHUNK_SIZE) as f:
+                # Reserving disk space upfront when the size is known, instead of growing the file with every write
+                if content_length and not response.headers.get("Content-Encoding"):
+                    preallocate_file(f.fileno(), content_length)
+
+                response.raw.decode_content = True  # Decode gzip/deflate content like iter_content does
+                shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+
+                # Dropping any reserved space beyond the written content
+                f.truncate()
+        except Exception:
+            # Removing the partially written file so that it isn't treated as downloaded on the next run
+            os.remove(file_path)
+            raise
+
+    return file_path
+
+
+def _download_memories(df: pd.DataFrame, download_dir: str, max_workers: int):
     """
-    Downloads memories sequentially based on the data in the DataFrame.
+    Downloads memories concurrently based on the data in the DataFrame, using given number of worker threads.
     """
 
     # Create the download directory if it doesn't exist
@@ -145,69 +267,114 @@ def _download_memories(df: pd.DataFrame, download_dir: str):
     already_downloaded_files = get_already_downloaded_files(download_dir)
     logger.info(f"Already downloaded files count: {len(already_downloaded_files)}")
 
-    for i, row in df.iterrows():
-        download_link = row["download_link"]
-        is_get_request = row["is_get_request"]
-        file_name = row["file_name"]
-
-        # Checking if file already downloaded
-        if file_name in already_downloaded_files:
-            file_path = already_downloaded_files[file_name]
-            base_file_path = os.path.basename(file_path)
-            _, extension = os.path.splitext(base_file_path)
-
-            # Updating dataframe from already downloaded information
-            df.loc[i, "file_path"] = file_path
-            df.loc[i, "is_zip"] = extension == ".zip"
-            df.loc[i, "is_extracted"] = "extracted" in file_name
-
-            logger.info(f"Skipping row {i}: File already downloaded: '{base_file_path}'")
-            continue
-
-        # Checking if download link exists
-        if not download_link:
-            logger.warning(f"Skipping row {i}: Missing download link.")
-            continue
-
+    # Collecting download results by row position, the dataframe columns are assigned once all downloads finish
+    file_paths = df["file_path"].tolist()
+    is_zips = df["is_zip"].tolist()
+    is_extracted = df["is_extracted"].tolist()
+
+    # Sizing the connection pool so that every worker keeps its connections alive
+    adapter = HTTPAdapter(
+        pool_connections=max_workers,
+        pool_maxsize=max_workers * RANGE_DOWNLOAD_PARTS,  # Large memories use a connection per byte range
+        max_retries=0,  # Failed requests are retried by the retry decorator instead
+    )
+    _SESSION.mount("https://", adapter)
+    _SESSION.mount("http://", adapter)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
         try:
-            # Fetching response
-            response = _fetch_response(download_link, is_get_request)
-
-            # Determining extension from response
-            extension = get_extension(response)
-
-            # Checking if the downloaded file is a zip
-            if extension == ".zip":
-                df.loc[i, "is_zip"] = True
-
-            # Constructing base file path
-            base_file_path = f"{file_name}{extension}"
+            futures = {}
+
+            rows = zip(df["download_link"], df["is_get_request"], df["file_name"])
+            for i, (download_link, is_get_request, file_name) in enumerate(rows):
+                # Checking if file already downloaded
+                if file_name in already_downloaded_files:
+                    # Updating results from already downloaded information
+                    file_paths[i], is_zips[i], is_extracted[i] = already_downloaded_files[file_name]
+
+                    logger.info(f"Skipping row {i}: File already downloaded: '{file_paths[i]}'")
+                    continue
+
+                # Checking if download link exists
+                if pd.isna(download_link) or not download_link:
+                    logger.warning(f"Skipping row {i}: Missing download link.")
+                    continue
+
+                # Downloading memory in a worker thread, requests are paced by the rate limit on _fetch_response
+                future = executor.submit(_download_memory, download_link, is_get_request, file_name, download_dir)
+                futures[future] = (i, download_link)
+
+            # Collecting results as downloads complete
+            for future in as_completed(futures):
+                i, download_link = futures[future]
+                try:
+                    file_path = future.result()
+                    base_file_path = os.path.basename(file_path)
+
+                    # Adding file path to results and checking if the downloaded file is a zip
+                    file_paths[i] = file_path
+                    is_zips[i] = base_file_path.endswith(".zip")
+
+                    completed_downloads += 1
+                    logger.info(
+                        f"[{completed_downloads}/{total_downloads}] Successfully downloaded: '{base_file_path}'"
+                    )
+
+                except requests.exceptions.HTTPError as e:
+                    logger.error(f"[{i + 1}/{total_downloads}] Download failed for '{download_link}': {e}.")
+                except Exception as e:
+                    logger.error(f"[{i + 1}/{total_downloads}] An unexpected error occurred for '{download_link}': {e}")
+        except BaseException:
+            # Cancelling queued downloads on interrupt, only the ones in flight are awaited
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    # Updating dataframe with download results
+    df["file_path"] = pd.Series(file_paths, index=df.index, dtype=object)  # Keeping None for missing files
+    df["is_zip"] = is_zips
+    df["is_extracted"] = is_extracted
+
+
+def _handle_zip(row: pd.Series, download_dir: str) -> List[dict]:
+    """Extracts media archived in a downloaded zip file, returns the dataframe rows for the extracted media"""
+
+    zip_file_path = row["file_path"]
+    zip_file_name = row["file_name"]
+    new_rows = []
 
-            # Adding file path to dataframe
-            file_path = os.path.join(download_dir, base_file_path)
-            df.loc[i, "file_path"] = file_path
+    # Extract the ZIP file, each archived file is written straight to its final path in the download folder
+    with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
+        archived_files = [info for info in zip_ref.infolist() if not info.is_dir()]
+        for i, info in enumerate(archived_files):
+            # Ignore macOS resource files or system files, including anything inside the __MACOSX folder
+            if any(is_system_file(part) for part in info.filename.split("/")):
+                continue
 
-            # Save the file content
-            with open(file_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Final file name to use for extracted file (zip_filename_extracted_index+1)
+            _, extension = os.path.splitext(info.filename)
+            final_extracted_file_name = f"{zip_file_name}_extracted_{i + 1}"
+            final_extracted_file_path = os.path.join(download_dir, f"{final_extracted_file_name}{extension}")
 
-            completed_downloads += 1
-            logger.info(f"[{completed_downloads}/{total_downloads}] Successfully downloaded: '{base_file_path}'")
+            # Write the archived file to the parent download directory
+            with zip_ref.open(info) as source, open(final_extracted_file_path, "wb") as target:
+                shutil.copyfileobj(source, target, length=EXTRACT_CHUNK_SIZE)
 
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"[{i + 1}/{total_downloads}] Download failed for '{download_link}': {e}.")
-        except Exception as e:
-            logger.error(f"[{i + 1}/{total_downloads}] An unexpected error occurred for '{download_link}': {e}")
+            # Creating new row entry for dataframe
+            new_row = row.to_dict()
+            new_row["file_name"] = final_extracted_file_name  # without extension
+            new_row["file_path"] = final_extracted_file_path
+            new_row["is_zip"] = False
+            new_row["is_extracted"] = True  # Keeping track of extracted memories
+            new_rows.append(new_row)
 
-        # Apply sequential delay
-        if completed_downloads < total_downloads:
-            logger.debug(f"Waiting for {DOWNLOAD_DELAYS_SEC} seconds...")
-            time.sleep(DOWNLOAD_DELAYS_SEC)
+    return new_rows
 
 
-def _handle_zips(df: pd.DataFrame, download_dir: str):
-    """Handling zip file downloaded by extracting media archived in the zip"""
+def _handle_zips(df: pd.DataFrame, download_dir: str) -> pd.DataFrame:
+    """
+    Handling zip file downloaded by extracting media archived in the zip.
+    Returns the dataframe with rows added for the extracted media.
+    """
 
     # Filtering out non-zip files
     zip_df = df[df["is_zip"] == True]
@@ -216,83 +383,53 @@ def _handle_zips(df: pd.DataFrame, download_dir: str):
     completed_unzips = 0
     new_rows = []
 
-    for _, row in zip_df.iterrows():
-        zip_file_path = row["file_path"]
-        zip_file_name = row["file_name"]
-
-        # Use the file name (without .zip) as the temporary extraction folder name
-        temp_extract_dir = os.path.join(download_dir, f"temp_{zip_file_name}")
-
+    # Extracting zip files in parallel, decompression and file operations release the GIL
+    with ThreadPoolExecutor(max_workers=MAX_EXTRACT_WORKERS) as executor:
         try:
-            # Extract the ZIP file
-            with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-                # Create the temporary directory inside the download folder
-                os.makedirs(temp_extract_dir, exist_ok=True)
-                zip_ref.extractall(temp_extract_dir)
-                logger.debug(f"Successfully extracted to: '{temp_extract_dir}'")
-
-            # Process extracted files, rename, and move
-            extracted_files_count = 0
-            for root, _, extractable_files in os.walk(temp_extract_dir):
-                for i, extractable_file_name in enumerate(extractable_files):
-                    # Ignore macOS resource files or system files
-                    if is_system_file(extractable_file_name):
-                        continue
-
-                    # Extract file path in temp directory
-                    extractable_file_path = os.path.join(root, extractable_file_name)
-                    _, extension = os.path.splitext(extractable_file_name)
-
-                    # Final file name to use for extracted file (zip_filename_extracted_index+1)
-                    final_extracted_base_file_path = f"{zip_file_name}_extracted_{i + 1}{extension}"
-                    final_extracted_file_path = os.path.join(download_dir, final_extracted_base_file_path)
-
-                    # Move the file to the parent download directory
-                    shutil.move(extractable_file_path, final_extracted_file_path)
-
-                    # Creating new row entry for dataframe
-                    new_row = row.copy()
-                    new_row["file_name"] = os.path.splitext(final_extracted_base_file_path)[0]  # without extension
-                    new_row["file_path"] = final_extracted_file_path
-                    new_row["is_zip"] = False
-                    new_row["is_extracted"] = True  # Keeping track of extracted memories
-                    new_rows.append(new_row)
-
-                    extracted_files_count += 1
-
-            completed_unzips += 1
-            logger.info(
-                f"[{completed_unzips}/{total_unzips}] Successfully moved {extracted_files_count} files to '{download_dir}'."
-            )
-
-        except zipfile.BadZipFile:
-            logger.error(f"Error: The downloaded file '{zip_file_path}' is not a valid ZIP file.")
-        except Exception as e:
-            logger.error(f"Error processing ZIP file '{zip_file_path}': {e}")
-        finally:
-            # Clean up the temporary folder
-            if os.path.exists(temp_extract_dir):
-                shutil.rmtree(temp_extract_dir)
-                logger.debug(f"Deleted temporary folder: {temp_extract_dir}")
-
-    # Append new rows to the DataFrame
-    for new_row in new_rows:
-        df.loc[len(df)] = new_row
+            futures = {
+                executor.submit(_handle_zip, row, download_dir): row["file_path"] for _, row in zip_df.iterrows()
+            }
+
+            for future in as_completed(futures):
+                zip_file_path = futures[future]
+                try:
+                    extracted_rows = future.result()
+                    new_rows.extend(extracted_rows)
+
+                    completed_unzips += 1
+                    logger.info(
+                        f"[{completed_unzips}/{total_unzips}] Successfully moved {len(extracted_rows)} files to '{download_dir}'."
+                    )
+
+                except zipfile.BadZipFile:
+                    logger.error(f"Error: The downloaded file '{zip_file_path}' is not a valid ZIP file.")
+                except Exception as e:
+                    logger.error(f"Error processing ZIP file '{zip_file_path}': {e}")
+        except BaseException:
+            # Cancelling queued extractions on interrupt instead of waiting for every zip file
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
 
     logger.info(f"Added {len(new_rows)} new memories to dataframe!")
 
+    # Append new rows to the DataFrame at once
+    if not new_rows:
+        return df
+    return pd.concat([df, pd.DataFrame(new_rows, columns=df.columns)], ignore_index=True)
 
-def _update_media_metadata_pyexiftool(file_path: str, timestamp_str: str, lat: float, lon: float):
+
+def _update_media_metadata_pyexiftool(
+        et: Optional[ExifToolHelper], file_paths: List[str], timestamp_str: str, lat: float, lon: float
+):
     """
-    Updates the metadata (Exif/XMP) of a media file using the pyexiftool library,
-    which requires the external ExifTool utility to be installed.
+    Updates the metadata (Exif/XMP) of media files sharing capture time and location using the pyexiftool library,
+    which requires the external ExifTool utility to be installed. All files are written by a single command of the
+    already running ExifTool process, metadata isn't written if ExifTool isn't available.
 
     Also updates the OS-level access and modify time.
     """
 
-    if not os.path.exists(file_path):
-        logger.error(f"File not found: '{file_path}'")
-        return
+    base_file_paths = ", ".join(f"'{os.path.basename(file_path)}'" for file_path in file_paths)
 
     # Parse Timestamp
     try:
@@ -300,7 +437,7 @@ def _update_media_metadata_pyexiftool(file_path: str, timestamp_str: str, lat: f
         dt_object = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S UTC")
         exif_datetime_format = dt_object.strftime("%Y:%m:%d %H:%M:%S")
     except ValueError as e:
-        logger.error(f"Error parsing data for '{file_path}': {e}")
+        logger.error(f"Error parsing data for {base_file_paths}: {e}")
         return
 
     # Format the coordinates as D/M/S (or decimal) string with N/S/E/W suffix for GPSCoordinates tag
@@ -336,68 +473,116 @@ def _update_media_metadata_pyexiftool(file_path: str, timestamp_str: str, lat: f
     }
 
     # Apply Metadata using pyexiftool
-    base_file_path = os.path.basename(file_path)
-    try:
-        with ExifToolHelper() as et:
+    if et is not None:
+        try:
             # The execute method is used for writing. It handles escaping and execution.
-            # -overwrite_original tells ExifTool to directly modify the file.
+            # -overwrite_original tells ExifTool to directly modify the files.
             et.execute(
                 "-overwrite_original",
                 # Map Python dictionary keys/values to ExifTool -TAG=VALUE format
                 *[f"-{k}={v}" for k, v in metadata_tags.items()],
-                file_path
+                *file_paths
             )
 
-        logger.debug(f"Metadata updated successfully using pyexiftool: '{base_file_path}'")
+            logger.debug(f"Metadata updated successfully using pyexiftool: {base_file_paths}")
 
-    except FileNotFoundError:
-        logger.error(f"Error: The external **ExifTool utility was not found**.")
-        logger.error("Please ensure ExifTool is installed on your system and available in the PATH.")
-    except Exception as e:
-        logger.error(f"An error occurred during metadata writing for '{base_file_path}': {e}")
+        except Exception as e:
+            logger.error(f"An error occurred during metadata writing for {base_file_paths}: {e}")
 
     # Changing date of capture to unix timestamp
     dt_object = pd.to_datetime(timestamp_str, utc=True)
     unix_timestamp = dt_object.timestamp()
 
     # Changing the OS-level timestamps
-    try:
-        # Set both access time and modification time to the capture time
-        os.utime(file_path, (unix_timestamp, unix_timestamp))
-        logger.debug(f"OS Filesystem timestamps updated: '{os.path.basename(file_path)}'")
-    except Exception as e:
-        logger.error(f"Failed to update filesystem time for {file_path}: {e}")
+    for file_path in file_paths:
+        try:
+            # Set both access time and modification time to the capture time
+            os.utime(file_path, (unix_timestamp, unix_timestamp))
+            logger.debug(f"OS Filesystem timestamps updated: '{os.path.basename(file_path)}'")
+        except Exception as e:
+            logger.error(f"Failed to update filesystem time for {file_path}: {e}")
 
 
 def _update_memories_metadata(df: pd.DataFrame):
     """Updates downloaded media's metadata to fix capture time and location"""
 
-    # Filtering out zip files
-    non_zip_df = df[df["is_zip"] == False]
+    # Filtering out zip files and memories which couldn't be downloaded
+    non_zip_df = df[(df["is_zip"] == False) & df["file_path"].notna()]
 
     total_updates = len(non_zip_df)
     completed_updates = 0
 
-    for i, row in non_zip_df.iterrows():
-        file_path = row["file_path"]
-        timestamp_str = row["timestamp_str"]
-        lat = row["lat"]
-        lon = row["lon"]
-        base_file_path = os.path.basename(file_path)
+    # Memories extracted from the same zip share capture time and location, so they are updated together
+    groups = []
+    for (timestamp_str, lat, lon), group_df in non_zip_df.groupby(["timestamp_str", "lat", "lon"], sort=False):
+        file_paths = []
+        for file_path in group_df["file_path"]:
+            if os.path.exists(file_path):
+                file_paths.append(file_path)
+            else:
+                logger.error(f"File not found: '{file_path}'")
+
+        if file_paths:
+            groups.append((file_paths, timestamp_str, lat, lon))
+
+    # Starting persistent ExifTool processes shared by the worker threads, the work itself happens in those processes.
+    # They are started from this thread as ExifTool is terminated when the thread which started it exits (on Linux).
+    exiftools = queue.Queue()
+    try:
+        for _ in range(min(MAX_METADATA_WORKERS, len(groups))):
+            et = ExifToolHelper()
+            et.run()
+            exiftools.put(et)
+        is_exiftool_available = True
+    except FileNotFoundError:
+        logger.error(f"Error: The external **ExifTool utility was not found**.")
+        logger.error("Please ensure ExifTool is installed on your system and available in the PATH.")
+        is_exiftool_available = False
+
+    def _update(file_paths: List[str], timestamp_str: str, lat: float, lon: float) -> List[str]:
+        # Borrowing an ExifTool process, there is one per concurrently running update
+        et = exiftools.get() if is_exiftool_available else None
+        try:
+            _update_media_metadata_pyexiftool(et, file_paths, timestamp_str, lat, lon)
+        finally:
+            if et is not None:
+                exiftools.put(et)
+        return file_paths
+
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_METADATA_WORKERS) as executor:
+            try:
+                # Updating media
+                futures = [executor.submit(_update, *group) for group in groups]
+
+                for future in as_completed(futures):
+                    try:
+                        file_paths = future.result()
+                    except Exception as e:
+                        logger.error(f"An error occurred during metadata update: {e}")
+                        continue
 
-        # Updating media
-        _update_media_metadata_pyexiftool(file_path, timestamp_str, lat, lon)
+                    for file_path in file_paths:
+                        base_file_path = os.path.basename(file_path)
+                        completed_updates += 1
+                        logger.info(f"[{completed_updates}/{total_updates}] Successfully updated: '{base_file_path}'")
+            except BaseException:
+                # Cancelling queued updates on interrupt instead of waiting for every group
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
 
-        completed_updates += 1
-        logger.info(f"[{completed_updates}/{total_updates}] Successfully updated: '{base_file_path}'")
+    finally:
+        while not exiftools.empty():
+            exiftools.get().terminate()
 
 
-def download_memories(memories_file_path: str, download_dir: str):
+def download_memories(memories_file_path: str, download_dir: str, max_workers: int = MAX_DOWNLOAD_WORKERS):
     """
     Downloads Snapchat memories from "memories_history.html" file provided by Snapchat when you export memories.
 
     :param memories_file_path: Path to "memories_history.html"
     :param download_dir: Path to directory where memories should be downloaded
+    :param max_workers: Number of memories downloaded concurrently
     :return: None
     """
 
@@ -419,7 +604,7 @@ def download_memories(memories_file_path: str, download_dir: str):
     logger.info("-" * 50)
 
     # Start the download process
-    _download_memories(df, download_dir)
+    _download_memories(df, download_dir, max_workers)
 
     # Logging stats
     logger.info(f"Total zip files: {df[df["is_zip"] == True].shape[0]}")
@@ -429,7 +614,7 @@ def download_memories(memories_file_path: str, download_dir: str):
     logger.info("-" * 50)
 
     # Unzipping zip and saving them in downloads folder
-    _handle_zips(df, download_dir)
+    df = _handle_zips(df, download_dir)
 
     logger.info("-" * 50)
     logger.info("** UPDATING METADATA **")
@@ -1,6 +1,8 @@
+import functools
 import logging
 import os
 import re
+import threading
 import time
 from typing import Dict, Tuple
 
@@ -8,6 +10,9 @@ import requests
 
 logger = logging.getLogger(__file__)
 
+# File name suggested by the server in the Content-Disposition header
+_CD_FILENAME_RE = re.compile(r'filename="?([^"]+)"?')
+
 
 def retry(max_retries=3, delay=1, exceptions=(Exception,)):
     """Decorator to retry on exception"""
@@ -29,35 +34,55 @@ def retry(max_retries=3, delay=1, exceptions=(Exception,)):
     return decorator
 
 
+def rate_limit(calls_per_sec: float):
+    """Decorator to cap how often a function is called, shared across threads"""
+
+    interval = 1 / calls_per_sec
+    lock = threading.Lock()
+    next_call_at = 0.0
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal next_call_at
+            # Reserving the next free slot, callers only wait for their own slot and never for each other's calls
+            with lock:
+                now = time.monotonic()
+                wait = next_call_at - now
+                next_call_at = max(now, next_call_at) + interval
+            if wait > 0:
+                time.sleep(wait)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
 def is_system_file(file_name: str) -> bool:
     """Indicates whether file is system generated"""
 
     return file_name.startswith('__MACOSX') or file_name.startswith('.')
 
 
-def get_already_downloaded_files(download_dir: str) -> Dict[str, str]:
-    """Already downloaded filenames in the download directory"""
-    files = {}
-    for base_file_path in os.listdir(download_dir):
+def get_already_downloaded_files(download_dir: str) -> Dict[str, Tuple[str, bool, bool]]:
+    """Already downloaded filenames in the download directory mapped to their path, is_zip and is_extracted flags"""
+    with os.scandir(download_dir) as entries:
         # Ignore macOS resource files or system files
-        if not is_system_file(base_file_path):
-            file_name, _ = os.path.splitext(base_file_path)
-            files[file_name] = os.path.join(download_dir, base_file_path)
-    return files
+        return {
+            os.path.splitext(entry.name)[0]: (entry.path, entry.name.endswith(".zip"), "_extracted_" in entry.name)
+            for entry in entries if not is_system_file(entry.name)
+        }
 
 
-def extract_latitude_longitude(coordinates: str) -> Tuple[float, float]:
-    """
-    Extracts lat/log from coordinate string following pattern 'Latitude, Longitude: number, number'
-    """
+def preallocate_file(fd: int, size: int):
+    """Reserves disk space for a file of given size, falling back to extending the file where it isn't supported"""
 
-    match = re.search(r"Latitude, Longitude: (-?\d+\.?\d*), (-?\d+\.?\d*)", coordinates)
-    if not match:
-        print(f"Invalid coordinate format: {coordinates}")
-        lat, lon = 0.0, 0.0
-    else:
-        lat, lon = float(match.group(1)), float(match.group(2))
-    return lat, lon
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except (AttributeError, OSError):
+        # posix_fallocate is missing on macOS and Windows, and unsupported by some filesystems
+        os.ftruncate(fd, size)
 
 
 def get_extension(response: requests.Response) -> str:
@@ -69,7 +94,7 @@ def get_extension(response: requests.Response) -> str:
 
     if content_disp:
         # Attempt to extract file name from header
-        match = re.search(r'filename="?([^"]+)"?', content_disp)
+        match = _CD_FILENAME_RE.search(content_disp)
         if match:
             base_file_path = match.group(1)
             # Extract extension from base file path